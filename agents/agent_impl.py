@@ -2,9 +2,12 @@
 Mock Agent implementation for ComplianceGuard AI
 """
 
+import inspect
 from typing import Dict, List, Any, Callable
 import logging
 
+from tools.serialization import serialize_tool_result
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,7 +20,7 @@ class Agent:
         self.tools = tools or []
         self.description = description
         self.session = None
-        logger.info(f"Initialized Agent: {name} with model: {model}")
+        logger.info("Initialized Agent: %s with model: %s", name, model)
     
     async def start_session(self):
         """Start a new session"""
@@ -32,13 +35,19 @@ class Tool:
         self.name = name
         self.description = description
         self.func = func
-        logger.info(f"Initialized Tool: {name}")
+        logger.info("Initialized Tool: %s", name)
     
     async def execute(self, *args, **kwargs):
-        """Execute the tool"""
+        """Execute the tool; plain functions are called directly, coroutine functions awaited"""
         if self.func:
+            if inspect.iscoroutinefunction(self.func):
+                return await self.func(*args, **kwargs)
             return self.func(*args, **kwargs)
         return {"status": "success", "tool": self.name}
+    
+    async def execute_serialized(self, *args, **kwargs) -> bytes:
+        """Execute the tool and return its result as JSON bytes"""
+        return serialize_tool_result(await self.execute(*args, **kwargs))
 
 
 class AgentSession:
@@ -48,7 +57,7 @@ class AgentSession:
         self.agent_name = agent_name
         self.model = model
         self.messages = []
-        logger.info(f"Session started for agent: {agent_name}")
+        logger.info("Session started for agent: %s", agent_name)
     
     async def send_message(self, message: str) -> Dict[str, Any]:
         """Send a message to the agent"""
@@ -63,9 +72,9 @@ class AgentSession:
             "status": "success"
         }
         
-        logger.info(f"Agent {self.agent_name} responded to message")
+        logger.info("Agent %s responded to message", self.agent_name)
         return response
     
     async def close(self):
         """Close the session"""
-        logger.info(f"Session closed for agent: {self.agent_name}")
+        logger.info("Session closed for agent: %s", self.agent_name)
@@ -164,6 +164,18 @@ class ComplianceOrchestrator:
         
         self.monitoring_task = asyncio.create_task(monitoring_loop())
     
+    def reset(self):
+        """Reset workflow state so the orchestrator can be reused"""
+        # Dropping a live task would orphan the loop where shutdown() can no longer cancel it
+        if self.monitoring_task and not self.monitoring_task.done():
+            raise RuntimeError("Cannot reset while continuous monitoring is running; call shutdown() first")
+
+        self.monitoring_task = None
+        self.workflow_history.clear()
+        
+        if self.memory_bank:
+            self.memory_bank.clear()
+    
     async def get_workflow_history(self) -> List[Dict]:
         """Get workflow execution history"""
         return self.workflow_history.copy()
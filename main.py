@@ -7,6 +7,7 @@ Multi-agent system for enterprise compliance automation
 import asyncio
 import logging
 from typing import Dict, Any
+import orjson
 import yaml
 
 from agents.orchestrator import ComplianceOrchestrator
@@ -85,7 +86,10 @@ async def main():
                 company_data = json.load(f)
             
             results = await compliance_ai.execute_compliance_check(company_data)
-            print(json.dumps(results, indent=2))
+            print(orjson.dumps(
+                results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+            ).decode())
             
     except KeyboardInterrupt:
         logger.info("Received interrupt signal")
@@ -4,7 +4,7 @@ Long-term memory storage with context compaction
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 import json
 
@@ -32,6 +32,22 @@ class ComplianceMemoryBank:
             "last_compaction": None
         }
     
+    def clear(self):
+        """Drop all stored entries, patterns and metrics"""
+        self.memory_store.clear()
+        self.audit_trail.clear()
+        self.compliance_patterns.clear()
+        self.risk_profiles.clear()
+        
+        self.metrics.update({
+            "total_stored": 0,
+            "compactions_performed": 0,
+            "memory_usage_mb": 0,
+            "last_compaction": None
+        })
+        
+        logger.info("Memory bank cleared")
+    
     async def store_compliance_check(self, company_id: str, compliance_data: Dict[str, Any]) -> str:
         """
         Store compliance check results in memory bank
@@ -43,6 +59,41 @@ class ComplianceMemoryBank:
         Returns:
             Memory entry ID
         """
+        entry_id = self._append_entry(company_id, compliance_data)
+        
+        # Check if compaction is needed
+        if self._should_compact():
+            await self._compact_memory()
+        
+        logger.info(f"Stored compliance check {entry_id} for company {company_id}")
+        
+        return entry_id
+    
+    async def store_compliance_checks_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Store many compliance check results in a single pass
+        
+        Args:
+            items: (company_id, compliance_data) pairs to store
+            
+        Returns:
+            Memory entry IDs in input order
+        """
+        entry_ids = [
+            self._append_entry(company_id, compliance_data)
+            for company_id, compliance_data in items
+        ]
+        
+        # Compaction is checked once for the whole batch
+        if self._should_compact():
+            await self._compact_memory()
+        
+        logger.info(f"Stored {len(entry_ids)} compliance checks in batch")
+        
+        return entry_ids
+    
+    def _append_entry(self, company_id: str, compliance_data: Dict[str, Any]) -> str:
+        """Build a memory entry, append it and record it in the audit trail"""
         entry_id = f"COMP-{company_id}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
         
         memory_entry = {
@@ -76,12 +127,6 @@ class ComplianceMemoryBank:
         # Update metrics
         self.metrics["total_stored"] += 1
         
-        # Check if compaction is needed
-        if self._should_compact():
-            await self._compact_memory()
-        
-        logger.info(f"Stored compliance check {entry_id} for company {company_id}")
-        
         return entry_id
     
     async def retrieve_compliance_history(self, company_id: str, 
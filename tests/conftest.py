@@ -0,0 +1,247 @@
+"""
+Shared pytest fixtures for ComplianceGuard AI tests
+Canned agent payloads for fast, mocked compliance workflows
+"""
+
+import asyncio
+import functools
+import sys
+import pytest
+from types import MappingProxyType
+from unittest.mock import AsyncMock, patch
+
+from agents.monitor_agent import RegulationMonitorAgent
+from agents.analyzer_agent import ComplianceAnalyzerAgent
+from agents.risk_agent import RiskAssessmentAgent
+from agents.reporter_agent import ReportGeneratorAgent
+from agents.orchestrator import ComplianceOrchestrator
+from memory.memory_bank import ComplianceMemoryBank
+from tools.setup_tools import initialize_tools
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and not available on Windows
+    uvloop = None
+
+# Run async tests on the libuv-based loop when it is installed
+if uvloop is not None and sys.platform != 'win32':
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+def _freeze(value):
+    """Recursively wrap dicts in read-only MappingProxyType views and lists in tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+REGULATORY_DATA = {
+    'regulatory_data': {
+        'GDPR': {'regulation': 'GDPR', 'jurisdiction': 'European Union', 'status': 'success'},
+        'HIPAA': {'regulation': 'HIPAA', 'jurisdiction': 'United States', 'status': 'success'}
+    },
+    'timestamp': '2025-01-01T00:00:00',
+    'sources_checked': 2,
+    'successful_fetches': 2
+}
+
+ANALYSIS_RESULTS = {
+    'overall_score': 85,
+    'regulation_scores': {'GDPR': 88, 'HIPAA': 82},
+    'gap_analysis': [
+        {
+            'regulation': 'GDPR',
+            'gap_type': 'consent_management',
+            'severity': 'medium',
+            'description': 'Missing consent management for GDPR compliance',
+            'affected_areas': ['data_processing', 'documentation']
+        }
+    ],
+    'recommendations': [
+        {
+            'regulation': 'GDPR',
+            'priority': 'medium',
+            'action': 'Address consent management gap',
+            'estimated_effort': 'medium',
+            'timeline': '60 days'
+        }
+    ],
+    'risk_assessment': {'risk_level': 'medium'},
+    'timestamp': 0.0
+}
+
+RISK_ASSESSMENT = {
+    'overall_risk_score': 15,
+    'risk_breakdown': {
+        'GDPR': {'score': 88, 'risk_level': 'low', 'weighted_risk': 0.12},
+        'HIPAA': {'score': 82, 'risk_level': 'medium', 'weighted_risk': 0.18}
+    },
+    'risk_factors': [],
+    'mitigation_strategies': [
+        {'risk_type': 'regulatory_changes', 'strategy': 'Enhanced regulatory monitoring', 'priority': 'medium'}
+    ],
+    'compliance_health': {},
+    'predicted_risks': [],
+    'timestamp': '2025-01-01T00:00:00'
+}
+
+COMPLIANCE_REPORT = {
+    'report_id': 'COMP-MOCK-001',
+    'executive_summary': {
+        'overall_compliance_score': 85,
+        'overall_risk_score': 15,
+        'compliance_status': 'good'
+    },
+    'detailed_analysis': {
+        'regulation_performance': {'GDPR': 88, 'HIPAA': 82},
+        'gap_breakdown': {'GDPR': ANALYSIS_RESULTS['gap_analysis']}
+    },
+    'recommendations': {'immediate_actions': []},
+    'action_plan': {},
+    'compliance_metrics': {},
+    'audit_readiness': {},
+    'generated_at': '2025-01-01T00:00:00',
+    'report_version': '1.0'
+}
+
+# Every mocked call returns the same immutable payload objects
+_FROZEN_REGULATORY_DATA = _freeze(REGULATORY_DATA)
+_FROZEN_ANALYSIS_RESULTS = _freeze(ANALYSIS_RESULTS)
+_FROZEN_RISK_ASSESSMENT = _freeze(RISK_ASSESSMENT)
+_FROZEN_COMPLIANCE_REPORT = _freeze(COMPLIANCE_REPORT)
+
+
+# Configs seen by cached_initialize_tools, keyed by id(); holding the
+# reference keeps ids from being reused by other objects
+_configs_by_id = {}
+
+
+@functools.lru_cache(maxsize=8)
+def _initialize_tools_by_id(config_id):
+    return initialize_tools(_configs_by_id[config_id])
+
+
+def cached_initialize_tools(config):
+    """initialize_tools() memoized on the identity of the config dict"""
+    _configs_by_id.setdefault(id(config), config)
+    return _initialize_tools_by_id(id(config))
+
+
+@pytest.fixture(scope="session")
+def tools_factory():
+    """Tool initializer that returns the same tools for the same config"""
+    return cached_initialize_tools
+
+
+@pytest.fixture(scope="session")
+def orchestrator_factory(tools_factory):
+    """
+    Orchestrator lookup that builds one orchestrator per config for the session
+
+    Each call resets the orchestrator's workflow state so tests start clean.
+    """
+    # Keyed by id(); the stored config keeps its id from being reused
+    orchestrators = {}
+
+    def get_orchestrator(config, max_entries=10000):
+        entry = orchestrators.get(id(config))
+        if entry is None:
+            memory_bank = ComplianceMemoryBank(max_entries=max_entries)
+            orchestrator = ComplianceOrchestrator(config, memory_bank, tools_factory(config))
+            entry = orchestrators[id(config)] = (config, orchestrator)
+        orchestrator = entry[1]
+        orchestrator.reset()
+        return orchestrator
+
+    return get_orchestrator
+
+
+@pytest.fixture(scope="session")
+def performance_config():
+    """Configuration optimized for performance testing and benchmarks"""
+    return {
+        'agents': {
+            'regulation_monitor': {
+                'model': 'gemini-2.0-flash-exp',
+                'tools': ['regulation_database_tool'],  # Minimal tools for perf
+                'polling_interval': 3600
+            },
+            'compliance_analyzer': {
+                'model': 'gemini-2.0-flash-exp',
+                'tools': ['compliance_gap_analyzer']
+            },
+            'risk_assessor': {
+                'model': 'gemini-2.0-flash-exp',  # Use flash for perf
+                'tools': ['risk_scoring_engine']
+            },
+            'report_generator': {
+                'model': 'gemini-2.0-flash-exp',
+                'tools': ['compliance_report_formatter']
+            }
+        },
+        'compliance': {
+            'regulations': ['GDPR', 'HIPAA']  # Reduced set for perf
+        }
+    }
+
+
+@pytest.fixture(scope="session")
+def performance_company_data():
+    """Optimized company data for performance testing and benchmarks"""
+    return {
+        'company_id': 'perf_test_company',
+        'company_name': 'Performance Test Corp',
+        'policies': [
+            {
+                'name': 'Data Policy',
+                'content': 'Basic data protection policy content for testing.'
+            }
+        ]
+    }
+
+
+# Minimal company shared by the load and concurrency tests; the policy
+# list is never mutated, so every check can reuse it
+_COMPANY_TEMPLATE = {
+    'company_name': '',
+    'policies': [{'name': 'Policy', 'content': 'Content'}]
+}
+
+
+async def run_compliance_check(orchestrator, company_id):
+    """Run a compliance check for a minimal synthetic company"""
+    return await orchestrator.execute_compliance_check({
+        **_COMPANY_TEMPLATE,
+        'company_id': company_id,
+        'company_name': f'Company {company_id}'
+    })
+
+
+@pytest.fixture(scope="session")
+def compliance_check_runner():
+    """Helper that runs a compliance check for a synthetic company id"""
+    return run_compliance_check
+
+
+@pytest.fixture
+def mock_agent_pipeline(request):
+    """
+    Replace the simulated agent work with canned payloads
+
+    Tests marked ``slow`` keep the real agent pipeline.
+    """
+    if request.node.get_closest_marker('slow'):
+        yield
+        return
+
+    with patch.object(RegulationMonitorAgent, 'gather_regulatory_data',
+                      AsyncMock(return_value=_FROZEN_REGULATORY_DATA)), \
+         patch.object(ComplianceAnalyzerAgent, 'analyze_compliance',
+                      AsyncMock(return_value=_FROZEN_ANALYSIS_RESULTS)), \
+         patch.object(RiskAssessmentAgent, 'assess_risk',
+                      AsyncMock(return_value=_FROZEN_RISK_ASSESSMENT)), \
+         patch.object(ReportGeneratorAgent, 'generate_report',
+                      AsyncMock(return_value=_FROZEN_COMPLIANCE_REPORT)):
+        yield
@@ -7,10 +7,12 @@ from .test_agents import TestAgentSystem
 from .test_tools import TestTools
 from .test_integration import TestIntegration
 from .test_performance import TestPerformance
+from .test_benchmarks import TestBenchmarks
 
 __all__ = [
     'TestAgentSystem',
     'TestTools', 
     'TestIntegration',
-    'TestPerformance'
+    'TestPerformance',
+    'TestBenchmarks'
 ]
\ No newline at end of file
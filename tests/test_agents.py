@@ -274,4 +274,17 @@ class TestAgentSystem:
                 
                 # Both should be in execution order (order may vary due to parallelism)
                 assert 'monitor' in execution_order
-                assert 'analyzer' in execution_order
\ No newline at end of file
+                assert 'analyzer' in execution_order    
+    @pytest.mark.asyncio
+    async def test_orchestrator_reset_refuses_while_monitoring(self, sample_config, sample_tools):
+        """reset() must not orphan a running monitoring loop"""
+        orchestrator = ComplianceOrchestrator(sample_config, None, sample_tools)
+        
+        await orchestrator.start_continuous_monitoring()
+        with pytest.raises(RuntimeError):
+            orchestrator.reset()
+        
+        # Once shutdown() has stopped the loop, reset() clears it
+        await orchestrator.shutdown()
+        orchestrator.reset()
+        assert orchestrator.monitoring_task is None
@@ -0,0 +1,44 @@
+"""
+Benchmarks for ComplianceGuard AI
+Track compliance check latency with pytest-benchmark
+
+Save a baseline with ``pytest tests/test_benchmarks.py --benchmark-autosave``
+and check for regressions with
+``--benchmark-compare --benchmark-compare-fail=mean:10%``.
+"""
+
+import pytest
+import asyncio
+
+pytest.importorskip("pytest_benchmark")
+
+
+pytestmark = pytest.mark.usefixtures('mock_agent_pipeline')
+
+
+class TestBenchmarks:
+    """Benchmark suite for ComplianceGuard AI"""
+    
+    @pytest.fixture
+    def shared_orchestrator(self, performance_config, orchestrator_factory):
+        """Session-wide orchestrator for the performance config, reset for each benchmark"""
+        return orchestrator_factory(performance_config)
+    
+    def test_bench_single_compliance_check(self, benchmark, shared_orchestrator, performance_company_data):
+        """Benchmark a single compliance check"""
+        result = benchmark(
+            lambda: asyncio.run(shared_orchestrator.execute_compliance_check(performance_company_data))
+        )
+        
+        assert result['workflow_metrics']['status'] == 'completed'
+        assert 0 <= result['analysis']['overall_score'] <= 100
+    
+    def test_bench_response_time_consistency(self, benchmark, shared_orchestrator, performance_company_data):
+        """Benchmark repeated compliance checks over fixed rounds"""
+        result = benchmark.pedantic(
+            lambda: asyncio.run(shared_orchestrator.execute_compliance_check(performance_company_data)),
+            rounds=10,
+            iterations=1
+        )
+        
+        assert result['workflow_metrics']['status'] == 'completed'
@@ -5,6 +5,12 @@ Test custom tool functionality and integrations
 
 import pytest
 import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
 from unittest.mock import Mock, patch
 from typing import Dict, Any
 
@@ -14,9 +20,17 @@ from tools.custom_tools import (
     policy_analyzer,
     regulatory_search_tool,
     audit_trail_generator,
+    audit_trail_stream,
     compliance_report_formatter
 )
 
+from tools import custom_tools
+from tools.results import GapAnalysisResult
+from tools._registry import TOOL_REGISTRY
+from tools.audit_writer import AuditWriter
+from tools.setup_tools import ensure_async, initialize_tools
+from agents.agent_impl import Tool
+
 from tools.mcp_tools import (
     regulation_database_tool,
     compliance_framework_tool
@@ -47,6 +61,43 @@ class TestTools:
         assert result['total_policies_analyzed'] == 2
         assert 0 <= result['compliance_score'] <= 100
         
+    @pytest.mark.asyncio
+    async def test_gap_analyzer_single_regulation(self):
+        """Test gap analysis against fewer than two regulations"""
+        sample_policies = [{'name': f'Policy {i}', 'content': 'Content'} for i in range(20)]
+        
+        result = await compliance_gap_analyzer(sample_policies, [{'name': 'GDPR'}])
+        
+        assert isinstance(result, GapAnalysisResult)
+        for gap in result.gap_details:
+            assert gap['affected_regulations'] == ['GDPR']
+        
+    @pytest.mark.asyncio
+    async def test_gap_analyzer_large_input(self):
+        """Test gap analysis offloaded to the worker process pool"""
+        sample_policies = [{'name': f'Policy {i}', 'content': 'Content'} for i in range(600)]
+        sample_regulations = [{'name': 'GDPR'}, {'name': 'HIPAA'}]
+        
+        result = await compliance_gap_analyzer(sample_policies, sample_regulations)
+        
+        assert isinstance(result, GapAnalysisResult)
+        assert result.total_policies_analyzed == 600
+        assert result.gaps_identified == len(result.gap_details)
+        
+    @pytest.mark.asyncio
+    async def test_gap_analyzer_recovers_broken_pool(self):
+        """Test that a dead worker does not leave the process pool broken"""
+        broken_pool = custom_tools._get_process_pool()
+        with pytest.raises(BrokenProcessPool):
+            broken_pool.submit(os._exit, 1).result()
+        
+        sample_policies = [{'name': f'Policy {i}', 'content': 'Content'} for i in range(600)]
+        result = await compliance_gap_analyzer(sample_policies, [{'name': 'GDPR'}])
+        
+        assert isinstance(result, GapAnalysisResult)
+        assert result.total_policies_analyzed == 600
+        assert custom_tools._PROCESS_POOL is not broken_pool
+        
     @pytest.mark.asyncio
     async def test_risk_scoring_engine(self):
         """Test risk scoring tool"""
@@ -94,6 +145,25 @@ class TestTools:
         assert 'missing_requirements' in result
         assert 0 <= result['coverage_percentage'] <= 100
         
+    @pytest.mark.asyncio
+    async def test_policy_analyzer_duplicate_requirements(self):
+        """Test that repeated requirements are only counted once"""
+        requirements = ['data protection', 'consent management', 'data protection']
+        
+        result = await policy_analyzer("Policy text", requirements)
+        
+        assert result.total_requirements == 2
+        assert len(set(result.missing_requirements)) == len(result.missing_requirements)
+        assert result.requirements_covered + len(result.missing_requirements) == 2
+        
+        # The no-text shortcut deduplicates the same way
+        empty = await policy_analyzer("", ['a', 'a'])
+        assert empty.total_requirements == 1
+        assert empty.missing_requirements == ['a']
+        
+        missing_text = await policy_analyzer(None, ['a'])
+        assert missing_text.coverage_percentage == 0.0
+        
     @pytest.mark.asyncio
     async def test_regulatory_search_tool(self):
         """Test regulatory search tool"""
@@ -126,6 +196,91 @@ class TestTools:
         assert result['total_events'] == len(sample_actions)
         assert len(result['events']) == len(sample_actions)
         
+        # The trail and its events come from a single UTC clock read
+        assert all(e['timestamp'] == result['generated_at'] for e in result['events'])
+        assert result['generated_at'].endswith('+00:00')
+        
+    @pytest.mark.asyncio
+    async def test_audit_writer(self, tmp_path):
+        """Test batched audit event persistence"""
+        path = tmp_path / "audit.jsonl"
+        writer = AuditWriter(str(path), flush_interval=60)
+        
+        result = await audit_trail_generator([{'type': 'policy_update'}, {}], audit_writer=writer)
+        
+        # Nothing is written until the writer flushes
+        assert not path.exists()
+        
+        await writer.stop()
+        
+        lines = path.read_text().splitlines()
+        assert len(lines) == result['total_events'] == 2
+        assert json.loads(lines[0])['action_type'] == 'policy_update'
+        
+    @pytest.mark.asyncio
+    async def test_audit_writer_stop_during_flush(self, tmp_path):
+        """Test that stop() waits for an in-flight write and keeps event order"""
+        path = tmp_path / "audit.jsonl"
+        writer = AuditWriter(str(path), flush_interval=0.01)
+        write_batch = writer._write_batch
+        first_write_started = threading.Event()
+        
+        def slow_write(batch):
+            if not first_write_started.is_set():
+                first_write_started.set()
+                time.sleep(0.2)
+            write_batch(batch)
+        
+        writer._write_batch = slow_write
+        
+        await writer.enqueue([{'n': 1}])
+        await asyncio.to_thread(first_write_started.wait)
+        await writer.enqueue([{'n': 2}])
+        await writer.stop()
+        
+        assert [json.loads(line)['n'] for line in path.read_text().splitlines()] == [1, 2]
+        
+    @pytest.mark.asyncio
+    async def test_audit_writer_retries_failed_write(self, tmp_path):
+        """Test that events from a failed write are kept and written by the next flush"""
+        path = tmp_path / "audit.jsonl"
+        writer = AuditWriter(str(path), flush_interval=60)
+        write_batch = writer._write_batch
+        failures = [OSError("disk full")]
+        
+        def flaky_write(batch):
+            if failures:
+                raise failures.pop()
+            write_batch(batch)
+        
+        writer._write_batch = flaky_write
+        
+        await writer.enqueue([{'n': 1}])
+        with pytest.raises(OSError):
+            await writer.flush()
+        
+        await writer.enqueue([{'n': 2}])
+        await writer.stop()
+        
+        assert [json.loads(line)['n'] for line in path.read_text().splitlines()] == [1, 2]
+        
+    @pytest.mark.asyncio
+    async def test_audit_trail_stream(self):
+        """Test incremental audit event streaming"""
+        sample_actions = [
+            {'type': 'policy_update', 'description': 'Updated data protection policy'},
+            {'type': 'control_testing', 'description': 'Quarterly access review'}
+        ]
+        
+        events = [event async for event in audit_trail_stream(sample_actions)]
+        
+        assert len(events) == len(sample_actions)
+        assert [e['action_type'] for e in events] == ['policy_update', 'control_testing']
+        assert all('event_id' in e and 'evidence_references' in e for e in events)
+        
+        # A generator is not a callable tool; it must not be dispatched like one
+        assert 'audit_trail_stream' not in TOOL_REGISTRY
+        
     @pytest.mark.asyncio
     async def test_compliance_report_formatter(self):
         """Test report formatting tool"""
@@ -142,23 +297,24 @@ class TestTools:
         
         format_types = ['executive', 'detailed', 'technical', 'regulatory']
         
-        for format_type in format_types:
-            result = await compliance_report_formatter(sample_report_data, format_type)
-            
+        results = await asyncio.gather(
+            *(compliance_report_formatter(sample_report_data, f) for f in format_types)
+        )
+        
+        for format_type, result in zip(format_types, results):
             assert 'report_id' in result
             assert 'format_type' in result
             assert 'sections_included' in result
             assert result['format_type'] == format_type
             assert len(result['sections_included']) > 0
             
-    @pytest.mark.asyncio
-    async def test_regulation_database_tool(self):
+    def test_regulation_database_tool(self):
         """Test regulation database access"""
         regulations = ['GDPR', 'HIPAA', 'SOX', 'UNKNOWN_REGULATION']
         
-        for regulation in regulations:
-            result = await regulation_database_tool(regulation)
-            
+        results = [regulation_database_tool(r) for r in regulations]
+        
+        for regulation, result in zip(regulations, results):
             assert 'query_timestamp' in result
             
             if regulation != 'UNKNOWN_REGULATION':
@@ -169,14 +325,13 @@ class TestTools:
                 assert 'error' in result
                 assert 'available_regulations' in result
                 
-    @pytest.mark.asyncio
-    async def test_compliance_framework_tool(self):
+    def test_compliance_framework_tool(self):
         """Test compliance framework access"""
         frameworks = ['NIST_CSF', 'ISO_27001', 'COBIT', 'UNKNOWN_FRAMEWORK']
         
-        for framework in frameworks:
-            result = await compliance_framework_tool(framework, 'technology')
-            
+        results = [compliance_framework_tool(f, 'technology') for f in frameworks]
+        
+        for framework, result in zip(frameworks, results):
             assert 'query_timestamp' in result
             
             if framework != 'UNKNOWN_FRAMEWORK':
@@ -187,6 +342,130 @@ class TestTools:
                 assert 'error' in result
                 assert 'available_frameworks' in result
                 
+    def test_regulation_text_encoding(self):
+        """Test that the GDPR penalty uses a single euro sign, not mojibake"""
+        penalties = regulation_database_tool('GDPR')['penalties']
+        
+        assert '\u20ac20 million' in penalties
+        assert '\u00e2' not in penalties
+        
+    def test_lookup_tool_bad_input(self):
+        """Test that invalid lookup arguments come back as error payloads"""
+        result = regulation_database_tool(None)
+        assert 'error' in result
+        
+        result = compliance_framework_tool('NIST_CSF', ['not', 'hashable'])
+        assert 'error' in result
+        
+    def test_framework_overlay_not_shared(self):
+        """Test that per-call overlays never leak into the shared framework table"""
+        with_industry = compliance_framework_tool('NIST_CSF', 'healthcare')
+        without_industry = compliance_framework_tool('NIST_CSF')
+        
+        assert with_industry['industry_context'] == 'healthcare'
+        assert 'industry_context' not in without_industry
+        assert dict(without_industry)['full_name'] == 'NIST Cybersecurity Framework'
+        
+        # Static parts are cached; the per-call overlay is not
+        again = compliance_framework_tool('NIST_CSF')
+        assert again.maps[1] is without_industry.maps[1]
+        assert again.maps[0] is not without_industry.maps[0]
+        
+    @pytest.mark.asyncio
+    async def test_tool_results_not_shared(self):
+        """Test that repeated queries return independent result objects"""
+        first = await compliance_report_formatter({'report_id': 'R-1'}, "executive")
+        first['report_id'] = 'CHANGED'
+        first['key_highlights'].append('EXTRA')
+        
+        second = await compliance_report_formatter({'report_id': 'R-1'}, "executive")
+        
+        assert second['report_id'] == 'R-1'
+        assert 'EXTRA' not in second['key_highlights']
+        
+    @pytest.mark.asyncio
+    async def test_tool_result_envelope(self):
+        """Test that result dataclasses keep dictionary-style access"""
+        result = await compliance_gap_analyzer([{'name': 'Policy'}], [{'name': 'GDPR'}])
+        
+        if sys.version_info >= (3, 10):  # slots are only requested from 3.10 on
+            assert not hasattr(result, '__dict__')
+        assert result['compliance_score'] == result.compliance_score
+        assert result.to_dict() == dict(result)
+        assert result == result.to_dict()
+        assert 'error' not in result
+        
+    @pytest.mark.asyncio
+    async def test_tool_registry(self):
+        """Test tool dispatch by name through the registry"""
+        assert TOOL_REGISTRY['compliance_gap_analyzer'] is compliance_gap_analyzer
+        assert TOOL_REGISTRY['regulation_database_tool'] is regulation_database_tool
+        
+        result = await TOOL_REGISTRY['policy_analyzer'](policy_text="Policy", regulation_requirements=[])
+        assert result['coverage_percentage'] == 100.0
+        
+    @pytest.mark.asyncio
+    async def test_tool_execute_sync_and_async(self):
+        """Test that Tool and ensure_async accept both sync and async tools"""
+        lookup = Tool('regulation_database_tool', func=regulation_database_tool)
+        analyzer = Tool('policy_analyzer', func=policy_analyzer)
+        
+        result = await lookup.execute('GDPR')
+        assert result['full_name'] == 'General Data Protection Regulation'
+        
+        result = await analyzer.execute("Policy", [])
+        assert result['coverage_percentage'] == 100.0
+        
+        payload = await lookup.execute_serialized('HIPAA')
+        assert json.loads(payload)['full_name'] == 'Health Insurance Portability and Accountability Act'
+        
+        result = await ensure_async(compliance_framework_tool)('COBIT')
+        assert 'domains' in result
+        assert ensure_async(policy_analyzer) is policy_analyzer
+        
+    def test_simulate_latency_env_precedence(self, monkeypatch):
+        """Test that the environment variable overrides the config's simulate_latency"""
+        import tools._latency as latency
+        
+        monkeypatch.setattr(latency, '_SIMULATE_LATENCY', True)
+        monkeypatch.setenv(latency.LATENCY_ENV_VAR, '1')
+        initialize_tools({'simulate_latency': False})
+        assert latency._SIMULATE_LATENCY is True
+        
+        monkeypatch.delenv(latency.LATENCY_ENV_VAR)
+        initialize_tools({'simulate_latency': False})
+        assert latency._SIMULATE_LATENCY is False
+        
+        # "0" parses as off rather than as a non-empty (truthy) string
+        monkeypatch.setenv(latency.LATENCY_ENV_VAR, '0')
+        assert latency.env_simulate_latency() is False
+        initialize_tools({'simulate_latency': True})
+        assert latency._SIMULATE_LATENCY is False
+        
+        # Values that are not booleans leave the decision to the config
+        monkeypatch.setenv(latency.LATENCY_ENV_VAR, 'maybe')
+        initialize_tools({'simulate_latency': True})
+        assert latency._SIMULATE_LATENCY is True
+        
+    def test_initialize_tools_enabled_subset(self):
+        """Test that enabled_tools narrows the initialized tool set"""
+        all_tools = initialize_tools({})
+        assert {'compliance_gap_analyzer', 'audit_trail_generator', 'compliance_framework_tool'} <= set(all_tools)
+        assert all(tool.func is TOOL_REGISTRY[name] for name, tool in all_tools.items())
+        
+        # The default set is frozen; callers get their own writable copy
+        all_tools_again = initialize_tools({})
+        all_tools_again.pop('policy_analyzer')
+        assert 'policy_analyzer' in initialize_tools({})
+        
+        tools = initialize_tools({'enabled_tools': ['policy_analyzer', 'regulation_database_tool']})
+        assert set(tools) == {'policy_analyzer', 'regulation_database_tool'}
+        assert tools['policy_analyzer'].func is policy_analyzer
+        
+        # Wrappers are shared across calls with the same tools version
+        assert tools['policy_analyzer'] is all_tools['policy_analyzer']
+        assert initialize_tools({'tools_version': 2})['policy_analyzer'] is not all_tools['policy_analyzer']
+        
     @pytest.mark.asyncio
     async def test_tool_error_handling(self):
         """Test tool error handling"""
@@ -196,6 +475,13 @@ class TestTools:
         # Should handle empty inputs gracefully
         assert 'total_policies_analyzed' in result
         assert result['total_policies_analyzed'] == 0
+        assert result['compliance_score'] == 100
+        
+        result = await policy_analyzer("", ['data protection'])
+        assert result['missing_requirements'] == ['data protection']
+        
+        result = await regulatory_search_tool("")
+        assert result['results'] == []
         
     @pytest.mark.asyncio 
     async def test_tool_performance(self):
@@ -213,6 +499,6 @@ class TestTools:
         end_time = time.time()
         execution_time = end_time - start_time
         
-        # Should complete within 2 seconds
-        assert execution_time < 2.0
+        # Should complete within 50 milliseconds
+        assert execution_time < 0.05
         assert 'compliance_score' in result
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Simulated Backend Latency
+Optional sleeps that let the mock tools mimic remote calls
+"""
+
+import asyncio
+import os
+from typing import Optional
+
+LATENCY_ENV_VAR = "COMPLIANCE_SIMULATE_LATENCY"
+_TRUE_VALUES = frozenset(("1", "true", "yes", "on"))
+_FALSE_VALUES = frozenset(("0", "false", "no", "off"))
+
+def env_simulate_latency() -> Optional[bool]:
+    """Parse COMPLIANCE_SIMULATE_LATENCY; None when it is unset or not a recognizable boolean"""
+    value = os.getenv(LATENCY_ENV_VAR, "").strip().lower()
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    return None
+
+# Off by default; enabled by the COMPLIANCE_SIMULATE_LATENCY env var or initialize_tools(config)
+_SIMULATE_LATENCY = bool(env_simulate_latency())
+
+def set_simulate_latency(enabled: bool):
+    """Turn simulated tool latency on or off for the whole process"""
+    global _SIMULATE_LATENCY
+    _SIMULATE_LATENCY = bool(enabled)
+
+async def simulate_latency(seconds: float):
+    """Sleep to mimic backend latency, only when simulated latency is enabled"""
+    if _SIMULATE_LATENCY:
+        await asyncio.sleep(seconds)
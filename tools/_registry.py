@@ -0,0 +1,14 @@
+"""
+Tool Registry
+Name-to-callable lookup for every function marked with tool_decorator
+"""
+
+from typing import Callable, Dict
+
+# Populated at import time by tool_decorator; dispatch with TOOL_REGISTRY[name](**kwargs)
+TOOL_REGISTRY: Dict[str, Callable] = {}
+
+def tool_decorator(func: Callable) -> Callable:
+    """Decorator to mark functions as tools and register them by name"""
+    TOOL_REGISTRY[func.__name__] = func
+    return func
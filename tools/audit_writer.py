@@ -0,0 +1,114 @@
+"""
+Audit Trail Persistence
+Batch audit events in memory and append them to disk with one fsync per interval
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Any, List, Iterable, Optional
+
+from .serialization import serialize_tool_result
+
+logger = logging.getLogger(__name__)
+
+class AuditWriter:
+    """
+    Append-only JSON Lines writer for audit events
+    Queued events are flushed by a background task every flush interval
+    rather than being fsynced one at a time
+    """
+    
+    def __init__(self, path: str, flush_interval: Optional[float] = None):
+        self.path = path
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else float(os.getenv("AUDIT_FSYNC_INTERVAL_SEC", "1.0"))
+        )
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        
+        # Events taken off the queue but not yet on disk; kept until a write succeeds
+        self._pending: List[Dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+        
+        # Background flush task and the event that asks it to exit
+        self.flush_task = None
+        self._stopping = asyncio.Event()
+    
+    async def start(self):
+        """Start the background flush task"""
+        logger.info("Starting audit writer for %s", self.path)
+        self._stopping.clear()
+        self.flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self):
+        """Stop the flush task and write any events still queued"""
+        if self.flush_task:
+            # Let the loop finish any in-flight write instead of cancelling it mid-batch
+            self._stopping.set()
+            await self.flush_task
+            self.flush_task = None
+        
+        await self.flush()
+        logger.info("Audit writer stopped")
+    
+    async def enqueue(self, events: Iterable[Dict[str, Any]]):
+        """
+        Queue audit events for the next flush
+        
+        Args:
+            events: Audit event dictionaries to persist
+        """
+        if self.flush_task is None:
+            await self.start()
+        
+        for event in events:
+            self.queue.put_nowait(event)
+    
+    async def flush(self) -> int:
+        """
+        Write every queued event with a single write and fsync
+        
+        Returns:
+            Number of events written
+        """
+        # Shielded so a cancelled caller cannot abandon a batch while its thread is still writing
+        return await asyncio.shield(self._flush_locked())
+    
+    async def _flush_locked(self) -> int:
+        """Write pending and queued events in order, one flush at a time"""
+        async with self._flush_lock:
+            while not self.queue.empty():
+                self._pending.append(self.queue.get_nowait())
+            
+            if not self._pending:
+                return 0
+            
+            count = len(self._pending)
+            await asyncio.to_thread(self._write_batch, self._pending)
+            
+            # Only forget the events once they are on disk; a failed write is retried next flush
+            self._pending = []
+            return count
+    
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        """Append a batch as JSON Lines and fsync once"""
+        payload = b"".join(serialize_tool_result(event) + b"\n" for event in batch)
+        with open(self.path, "ab") as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+    
+    async def _flush_loop(self):
+        """Background task to flush queued events until stop() is requested"""
+        while True:
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+                break  # stop() runs the final flush itself
+            except asyncio.TimeoutError:
+                pass
+            
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Audit flush error: %s", e)
@@ -9,6 +9,7 @@ from .custom_tools import (
     policy_analyzer,
     regulatory_search_tool,
     audit_trail_generator,
+    audit_trail_stream,
     compliance_report_formatter
 )
 
@@ -17,7 +18,21 @@ from .mcp_tools import (
     compliance_framework_tool
 )
 
-from .setup_tools import initialize_tools
+from .results import (
+    GapAnalysisResult,
+    RiskScoreResult,
+    PolicyAnalysisResult,
+    RegulatorySearchResult,
+    AuditTrailResult
+)
+
+from ._registry import TOOL_REGISTRY
+
+from .audit_writer import AuditWriter
+
+from .serialization import serialize_tool_result
+
+from .setup_tools import initialize_tools, ensure_async
 
 __all__ = [
     'compliance_gap_analyzer',
@@ -25,8 +40,18 @@ __all__ = [
     'policy_analyzer',
     'regulatory_search_tool',
     'audit_trail_generator',
+    'audit_trail_stream',
     'compliance_report_formatter',
     'regulation_database_tool',
     'compliance_framework_tool',
-    'initialize_tools'
+    'GapAnalysisResult',
+    'RiskScoreResult',
+    'PolicyAnalysisResult',
+    'RegulatorySearchResult',
+    'AuditTrailResult',
+    'TOOL_REGISTRY',
+    'AuditWriter',
+    'serialize_tool_result',
+    'initialize_tools',
+    'ensure_async'
 ]
\ No newline at end of file
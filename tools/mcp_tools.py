@@ -3,21 +3,168 @@ MCP Tools for ComplianceGuard AI
 Model Context Protocol tools for regulatory data access
 """
 
-import asyncio
+import functools
 import logging
-from typing import Dict, Any, List
-from agents.agent_impl import Tool
-from datetime import datetime
+import time
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+from datetime import datetime, timezone
 import random
 
+from ._registry import tool_decorator
+
 logger = logging.getLogger(__name__)
 
-def tool_decorator(func):
-    """Decorator to mark functions as tools"""
-    return func
+def _freeze_table(table: Dict[str, Dict[str, Any]]) -> Mapping[str, Mapping[str, Any]]:
+    """Wrap a lookup table and each of its entries in read-only views"""
+    return MappingProxyType({key: MappingProxyType(entry) for key, entry in table.items()})
+
+# Mock regulation database, built once at import and shared by every lookup
+_REGULATION_DB: Mapping[str, Mapping[str, Any]] = _freeze_table({
+    "GDPR": {
+        "full_name": "General Data Protection Regulation",
+        "jurisdiction": "European Union",
+        "effective_date": "2018-05-25",
+        "last_updated": "2025-01-15",
+        "key_requirements": (
+            "Data protection by design and by default",
+            "Lawful basis for processing",
+            "Data subject rights",
+            "Data breach notification",
+            "Data Protection Officer appointment"
+        ),
+        "applicability": "Organizations processing EU resident data",
+        "penalties": "Up to 4% of global annual turnover or €20 million",
+        "compliance_deadlines": ("Ongoing",),
+        "status": "Active"
+    },
+    "HIPAA": {
+        "full_name": "Health Insurance Portability and Accountability Act",
+        "jurisdiction": "United States",
+        "effective_date": "1996-08-21",
+        "last_updated": "2025-01-10", 
+        "key_requirements": (
+            "Privacy Rule - Protected Health Information",
+            "Security Rule - Administrative, Physical, Technical Safeguards",
+            "Breach Notification Rule",
+            "Enforcement Rule"
+        ),
+        "applicability": "Healthcare providers, health plans, healthcare clearinghouses",
+        "penalties": "Up to $1.5 million per violation category per year",
+        "compliance_deadlines": ("Ongoing",),
+        "status": "Active"
+    },
+    "SOX": {
+        "full_name": "Sarbanes-Oxley Act", 
+        "jurisdiction": "United States",
+        "effective_date": "2002-07-30",
+        "last_updated": "2025-01-05",
+        "key_requirements": (
+            "Section 302 - Corporate responsibility for financial reports",
+            "Section 404 - Management assessment of internal controls",
+            "Section 409 - Real-time issuer disclosures",
+            "Section 802 - Criminal penalties for altering documents"
+        ),
+        "applicability": "Publicly traded companies in the US",
+        "penalties": "Fines and imprisonment for willful violations",
+        "compliance_deadlines": ("Annual financial reporting",),
+        "status": "Active"
+    }
+})
+
+# Mock compliance frameworks
+_FRAMEWORKS: Mapping[str, Mapping[str, Any]] = _freeze_table({
+    "NIST_CSF": {
+        "full_name": "NIST Cybersecurity Framework",
+        "version": "2.0",
+        "domains": ("Identify", "Protect", "Detect", "Respond", "Recover"),
+        "controls_count": 108,
+        "applicability": "All organizations managing cybersecurity risk",
+        "maturity_levels": ("Partial", "Risk-Informed", "Repeatable", "Adaptive"),
+        "last_updated": "2024-02-26"
+    },
+    "ISO_27001": {
+        "full_name": "ISO/IEC 27001 Information Security Management",
+        "version": "2022",
+        "domains": ("Organizational", "People", "Physical", "Technological"),
+        "controls_count": 93,
+        "applicability": "Organizations requiring formal ISMS certification",
+        "maturity_levels": ("Implemented", "Managed", "Established", "Optimized"),
+        "last_updated": "2022-10-25"
+    },
+    "COBIT": {
+        "full_name": "Control Objectives for Information and Related Technologies", 
+        "version": "2019",
+        "domains": ("Align, Plan and Organize", "Build, Acquire and Implement", 
+                   "Deliver, Service and Support", "Monitor, Evaluate and Assess"),
+        "controls_count": 40,
+        "applicability": "Enterprise governance and management of information technology",
+        "maturity_levels": ("0-5 scale from Non-existent to Optimized",),
+        "last_updated": "2019-01-01"
+    }
+})
+
+# Resources offered with every framework
+_TRAINING_RESOURCES = ("Implementation guide", "Control mappings", "Assessment templates")
+
+# Module-private generator for the simulated values
+_rng = random.Random()
+
+# Whole second and its ISO timestamp; lookups within the same second share the string
+_ts_cache = [0, ""]
+
+def _iso_now_cached() -> str:
+    """Current UTC time as ISO 8601, formatted at most once per second"""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[:] = [now, datetime.fromtimestamp(now, timezone.utc).isoformat()]
+    return _ts_cache[1]
+
+# Static fields of a lookup miss, built once at import
+_REG_MISS_TEMPLATE = MappingProxyType({"available_regulations": tuple(_REGULATION_DB)})
+_FW_MISS_TEMPLATE = MappingProxyType({"available_frameworks": tuple(_FRAMEWORKS)})
+
+def _regulation_miss(regulation_name: str) -> Dict[str, Any]:
+    """Result for a regulation that is not in the database"""
+    return {
+        "error": f"Regulation '{regulation_name}' not found in database",
+        **_REG_MISS_TEMPLATE,
+        "query_timestamp": _iso_now_cached()
+    }
+
+def _framework_miss(framework_name: str) -> Dict[str, Any]:
+    """Result for a framework that is not in the catalogue"""
+    return {
+        "error": f"Framework '{framework_name}' not found",
+        **_FW_MISS_TEMPLATE,
+        "query_timestamp": _iso_now_cached()
+    }
+
+@functools.lru_cache(maxsize=128)
+def _lookup_regulation(regulation_key: str) -> Optional[Mapping[str, Any]]:
+    """Static part of a regulation result, built once per key; None when unknown"""
+    base = _REGULATION_DB.get(regulation_key)
+    if base is None:
+        return None
+    return MappingProxyType({**base, "update_frequency": "Daily"})
+
+@functools.lru_cache(maxsize=128)
+def _lookup_framework(framework_key: str, industry: Optional[str]) -> Optional[Mapping[str, Any]]:
+    """Static part of a framework result, built once per key and industry; None when unknown"""
+    base = _FRAMEWORKS.get(framework_key)
+    if base is None:
+        return None
+    
+    static = dict(base)
+    if industry:
+        static["industry_context"] = industry
+    static["implementation_guidance_available"] = True
+    static["training_resources"] = _TRAINING_RESOURCES
+    return MappingProxyType(static)
 
 @tool_decorator
-async def regulation_database_tool(regulation_name: str, jurisdiction: str = None) -> Dict[str, Any]:
+def regulation_database_tool(regulation_name: str, jurisdiction: str = None) -> Mapping[str, Any]:
     """
     Access regulatory database for specific regulation information
     
@@ -26,85 +173,25 @@ async def regulation_database_tool(regulation_name: str, jurisdiction: str = Non
         jurisdiction: Specific jurisdiction (optional)
         
     Returns:
-        Dictionary containing regulation details
+        Mapping of regulation details; call dict() for a detached copy
     """
-    logger.info(f"Accessing regulation database for: {regulation_name}")
+    logger.info("Accessing regulation database for: %s", regulation_name)
     
     try:
-        await asyncio.sleep(0.3)
+        base = _lookup_regulation(regulation_name.upper())
+        if base is None:
+            return _regulation_miss(regulation_name)
         
-        # Mock regulation database
-        regulation_db = {
-            "GDPR": {
-                "full_name": "General Data Protection Regulation",
-                "jurisdiction": "European Union",
-                "effective_date": "2018-05-25",
-                "last_updated": "2025-01-15",
-                "key_requirements": [
-                    "Data protection by design and by default",
-                    "Lawful basis for processing",
-                    "Data subject rights",
-                    "Data breach notification",
-                    "Data Protection Officer appointment"
-                ],
-                "applicability": "Organizations processing EU resident data",
-                "penalties": "Up to 4% of global annual turnover or €20 million",
-                "compliance_deadlines": ["Ongoing"],
-                "status": "Active"
-            },
-            "HIPAA": {
-                "full_name": "Health Insurance Portability and Accountability Act",
-                "jurisdiction": "United States",
-                "effective_date": "1996-08-21",
-                "last_updated": "2025-01-10", 
-                "key_requirements": [
-                    "Privacy Rule - Protected Health Information",
-                    "Security Rule - Administrative, Physical, Technical Safeguards",
-                    "Breach Notification Rule",
-                    "Enforcement Rule"
-                ],
-                "applicability": "Healthcare providers, health plans, healthcare clearinghouses",
-                "penalties": "Up to $1.5 million per violation category per year",
-                "compliance_deadlines": ["Ongoing"],
-                "status": "Active"
-            },
-            "SOX": {
-                "full_name": "Sarbanes-Oxley Act", 
-                "jurisdiction": "United States",
-                "effective_date": "2002-07-30",
-                "last_updated": "2025-01-05",
-                "key_requirements": [
-                    "Section 302 - Corporate responsibility for financial reports",
-                    "Section 404 - Management assessment of internal controls",
-                    "Section 409 - Real-time issuer disclosures",
-                    "Section 802 - Criminal penalties for altering documents"
-                ],
-                "applicability": "Publicly traded companies in the US",
-                "penalties": "Fines and imprisonment for willful violations",
-                "compliance_deadlines": ["Annual financial reporting"],
-                "status": "Active"
-            }
+        # Layer the dynamic data over the cached read-only entry without copying it
+        overlay = {
+            "query_timestamp": _iso_now_cached(),
+            "source_confidence": (90 + int(_rng.random() * 10)) / 100  # 0.90-0.99 in hundredths
         }
         
-        regulation_key = regulation_name.upper()
-        if regulation_key in regulation_db:
-            regulation_data = regulation_db[regulation_key]
-            
-            # Add some dynamic data
-            regulation_data["query_timestamp"] = datetime.now().isoformat()
-            regulation_data["source_confidence"] = round(random.uniform(0.9, 0.99), 2)
-            regulation_data["update_frequency"] = "Daily"
-            
-            return regulation_data
-        else:
-            return {
-                "error": f"Regulation '{regulation_name}' not found in database",
-                "available_regulations": list(regulation_db.keys()),
-                "query_timestamp": datetime.now().isoformat()
-            }
-            
-    except Exception as e:
-        logger.error(f"Regulation database access failed: {e}")
+        return ChainMap(overlay, base)
+        
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        logger.error("Regulation database access failed: %s", e)
         return {
             "error": str(e),
             "regulation_name": regulation_name,
@@ -112,7 +199,7 @@ async def regulation_database_tool(regulation_name: str, jurisdiction: str = Non
         }
 
 @tool_decorator
-async def compliance_framework_tool(framework_name: str, industry: str = None) -> Dict[str, Any]:
+def compliance_framework_tool(framework_name: str, industry: str = None) -> Mapping[str, Any]:
     """
     Access compliance frameworks and control sets
     
@@ -121,72 +208,25 @@ async def compliance_framework_tool(framework_name: str, industry: str = None) -
         industry: Specific industry context (optional)
         
     Returns:
-        Dictionary containing framework details and controls
+        Mapping of framework details and controls; call dict() for a detached copy
     """
-    logger.info(f"Accessing compliance framework: {framework_name}")
+    logger.info("Accessing compliance framework: %s", framework_name)
     
     try:
-        await asyncio.sleep(0.4)
+        base = _lookup_framework(framework_name.upper(), industry)
+        if base is None:
+            return _framework_miss(framework_name)
         
-        # Mock compliance frameworks
-        frameworks = {
-            "NIST_CSF": {
-                "full_name": "NIST Cybersecurity Framework",
-                "version": "2.0",
-                "domains": ["Identify", "Protect", "Detect", "Respond", "Recover"],
-                "controls_count": 108,
-                "applicability": "All organizations managing cybersecurity risk",
-                "maturity_levels": ["Partial", "Risk-Informed", "Repeatable", "Adaptive"],
-                "last_updated": "2024-02-26"
-            },
-            "ISO_27001": {
-                "full_name": "ISO/IEC 27001 Information Security Management",
-                "version": "2022",
-                "domains": ["Organizational", "People", "Physical", "Technological"],
-                "controls_count": 93,
-                "applicability": "Organizations requiring formal ISMS certification",
-                "maturity_levels": ["Implemented", "Managed", "Established", "Optimized"],
-                "last_updated": "2022-10-25"
-            },
-            "COBIT": {
-                "full_name": "Control Objectives for Information and Related Technologies", 
-                "version": "2019",
-                "domains": ["Align, Plan and Organize", "Build, Acquire and Implement", 
-                           "Deliver, Service and Support", "Monitor, Evaluate and Assess"],
-                "controls_count": 40,
-                "applicability": "Enterprise governance and management of information technology",
-                "maturity_levels": ["0-5 scale from Non-existent to Optimized"],
-                "last_updated": "2019-01-01"
-            }
-        }
+        overlay = {"query_timestamp": _iso_now_cached()}
+        
+        # Add industry-specific controls if provided
+        if industry:
+            overlay["industry_specific_controls"] = _rng.randrange(5, 21)
+        
+        return ChainMap(overlay, base)
         
-        framework_key = framework_name.upper()
-        if framework_key in frameworks:
-            framework_data = frameworks[framework_key]
-            
-            # Add industry-specific controls if provided
-            if industry:
-                framework_data["industry_context"] = industry
-                framework_data["industry_specific_controls"] = random.randint(5, 20)
-            
-            framework_data["query_timestamp"] = datetime.now().isoformat()
-            framework_data["implementation_guidance_available"] = True
-            framework_data["training_resources"] = [
-                "Implementation guide",
-                "Control mappings", 
-                "Assessment templates"
-            ]
-            
-            return framework_data
-        else:
-            return {
-                "error": f"Framework '{framework_name}' not found",
-                "available_frameworks": list(frameworks.keys()),
-                "query_timestamp": datetime.now().isoformat()
-            }
-            
-    except Exception as e:
-        logger.error(f"Framework access failed: {e}")
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        logger.error("Framework access failed: %s", e)
         return {
             "error": str(e),
             "framework_name": framework_name,
@@ -0,0 +1,86 @@
+"""
+Tool Result Envelopes
+Slotted dataclasses returned by the compliance tools
+"""
+
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Dict, Any, List, Iterator
+
+# eq=False keeps Mapping.__eq__ so envelopes compare equal to their dict form;
+# dataclass(slots=True) needs Python 3.10, older interpreters fall back to __dict__ instances
+_DATACLASS_OPTIONS = {"eq": False, "slots": True} if sys.version_info >= (3, 10) else {"eq": False}
+
+class _ResultMapping(Mapping):
+    """Read-only mapping view over dataclass fields so callers can keep using result['key']"""
+    
+    __slots__ = ()
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__dataclass_fields__)
+    
+    def __len__(self) -> int:
+        return len(self.__dataclass_fields__)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dictionary copy for JSON serialization"""
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
+@dataclass(**_DATACLASS_OPTIONS)
+class GapAnalysisResult(_ResultMapping):
+    """Result of compliance_gap_analyzer"""
+    total_policies_analyzed: int
+    gaps_identified: int
+    compliance_score: float
+    gap_details: List[Dict[str, Any]]
+    high_priority_gaps: List[Dict[str, Any]]
+    analysis_timestamp: str
+    confidence_score: float
+
+@dataclass(**_DATACLASS_OPTIONS)
+class RiskScoreResult(_ResultMapping):
+    """Result of risk_scoring_engine"""
+    overall_risk_score: float
+    risk_level: str
+    risk_breakdown: Dict[str, float]
+    key_risk_factors: List[str]
+    recommendations: List[str]
+    confidence_interval: str
+    calculation_timestamp: str
+
+@dataclass(**_DATACLASS_OPTIONS)
+class PolicyAnalysisResult(_ResultMapping):
+    """Result of policy_analyzer"""
+    policy_metrics: Dict[str, float]
+    requirements_covered: int
+    total_requirements: int
+    coverage_percentage: float
+    missing_requirements: List[str]
+    recommendations: List[str]
+    analysis_timestamp: str
+
+@dataclass(**_DATACLASS_OPTIONS)
+class RegulatorySearchResult(_ResultMapping):
+    """Result of regulatory_search_tool"""
+    query: str
+    jurisdictions_searched: List[str]
+    total_results: int
+    results: List[Dict[str, Any]]
+    search_timestamp: str
+
+@dataclass(**_DATACLASS_OPTIONS)
+class AuditTrailResult(_ResultMapping):
+    """Result of audit_trail_generator"""
+    audit_trail_id: str
+    timeframe_days: int
+    total_events: int
+    events: List[Dict[str, Any]]
+    completeness_score: int
+    generated_at: str
+    export_formats: List[str]
@@ -0,0 +1,27 @@
+"""
+Tool Result Serialization
+JSON encoding for tool results that cross the agent boundary
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+import orjson
+
+def _mapping_to_dict(obj: Any) -> dict:
+    """Unwrap the read-only views tools return (MappingProxyType, ChainMap, result envelopes)"""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def serialize_tool_result(obj: Any) -> bytes:
+    """
+    Encode a tool result as UTF-8 JSON
+    
+    Args:
+        obj: Tool result, usually a dict or one of the mapping views returned by the tools
+        
+    Returns:
+        JSON document as bytes
+    """
+    return orjson.dumps(obj, default=_mapping_to_dict)
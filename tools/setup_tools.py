@@ -3,26 +3,87 @@ Tool Setup and Initialization
 Configure and initialize all tools for ComplianceGuard AI
 """
 
+import functools
+import importlib
+import inspect
 import logging
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Iterable, Mapping, Optional
 from agents.agent_impl import Tool
 
-from .custom_tools import (
-    compliance_gap_analyzer,
-    risk_scoring_engine,
-    policy_analyzer,
-    regulatory_search_tool,
-    audit_trail_generator,
-    compliance_report_formatter
-)
-
-from .mcp_tools import (
-    regulation_database_tool,
-    compliance_framework_tool
-)
+from ._latency import env_simulate_latency, set_simulate_latency
+from ._registry import TOOL_REGISTRY
 
 logger = logging.getLogger(__name__)
 
+# Modules whose tool_decorator functions fill TOOL_REGISTRY; imported on first use by initialize_tools
+_TOOL_MODULES = ('.custom_tools', '.mcp_tools')
+
+def _load_tool_modules() -> Mapping[str, Callable]:
+    """Import every tool module (a no-op once cached in sys.modules) and return the registry they fill"""
+    for module_name in _TOOL_MODULES:
+        importlib.import_module(module_name, __package__)
+    return TOOL_REGISTRY
+
+# Tool wrappers reused across initialize_tools calls until config['tools_version'] changes
+_TOOL_CACHE: Dict[str, Tool] = {}
+_TOOL_CACHE_VERSION = None
+
+# Frozen full tool set for configs without per-tool overrides; built on first use
+_DEFAULT_TOOLS: Optional[Mapping[str, Tool]] = None
+
+def _cached_tool(name: str, func: Callable) -> Tool:
+    """Return the shared Tool wrapper for a tool function, creating it on first use"""
+    tool = _TOOL_CACHE.get(name)
+    if tool is None or tool.func is not func:
+        description = (func.__doc__ or "").strip().split("\n", 1)[0]
+        tool = _TOOL_CACHE[name] = Tool(name, description, func)
+    return tool
+
+def _sync_tool_cache(tools_version: Any):
+    """Drop cached wrappers and the frozen defaults when the tools version changes"""
+    global _TOOL_CACHE_VERSION, _DEFAULT_TOOLS
+    if tools_version != _TOOL_CACHE_VERSION:
+        _TOOL_CACHE.clear()
+        _DEFAULT_TOOLS = None
+        _TOOL_CACHE_VERSION = tools_version
+
+def _build_tools(enabled_tools: Optional[Iterable[str]] = None) -> Dict[str, Tool]:
+    """Collect every module's tools, optionally narrowed to the enabled ones, as Tool wrappers"""
+    tools = dict(_load_tool_modules())
+    
+    if enabled_tools is not None:
+        tools = {name: func for name, func in tools.items() if name in enabled_tools}
+    
+    return {name: _cached_tool(name, func) for name, func in tools.items()}
+
+def _default_tools() -> Mapping[str, Tool]:
+    """Return the frozen full tool set, building it once per tools version"""
+    global _DEFAULT_TOOLS
+    if _DEFAULT_TOOLS is None:
+        _DEFAULT_TOOLS = MappingProxyType(_build_tools())
+        logger.info("Default tool set frozen with %d tools", len(_DEFAULT_TOOLS))
+    return _DEFAULT_TOOLS
+
+def ensure_async(func: Callable) -> Callable:
+    """
+    Return a coroutine function for callers that always await their tools
+    
+    Args:
+        func: Sync or async tool function
+        
+    Returns:
+        The function itself if it is already a coroutine function, otherwise an async shim
+    """
+    if inspect.iscoroutinefunction(func):
+        return func
+    
+    @functools.wraps(func)
+    async def _shim(*args, **kwargs):
+        return func(*args, **kwargs)
+    
+    return _shim
+
 def initialize_tools(config: Dict[str, Any]) -> Dict[str, Tool]:
     """
     Initialize and configure all tools for the compliance system
@@ -31,31 +92,37 @@ def initialize_tools(config: Dict[str, Any]) -> Dict[str, Tool]:
         config: System configuration dictionary
         
     Returns:
-        Dictionary of initialized tools
+        Dictionary of Tool wrappers keyed by tool name
     """
     logger.info("Initializing compliance tools")
     
     tools_config = config.get('tools', {})
     
-    # Initialize custom tools
-    tools = {
-        'compliance_gap_analyzer': compliance_gap_analyzer,
-        'risk_scoring_engine': risk_scoring_engine,
-        'policy_analyzer': policy_analyzer,
-        'regulatory_search_tool': regulatory_search_tool,
-        'audit_trail_generator': audit_trail_generator,
-        'compliance_report_formatter': compliance_report_formatter,
-        'regulation_database_tool': regulation_database_tool,
-        'compliance_framework_tool': compliance_framework_tool
-    }
+    # Mock tools only sleep when asked; a boolean environment variable wins over the config
+    if 'simulate_latency' in config and env_simulate_latency() is None:
+        set_simulate_latency(config['simulate_latency'])
+    
+    # Reuse wrappers from earlier calls unless the tools version changed
+    _sync_tool_cache(config.get('tools_version'))
+    
+    # Without per-tool overrides the result is always the full default set
+    enabled_tools = config.get('enabled_tools')
+    if not tools_config and enabled_tools is None:
+        return dict(_default_tools())
+    
+    tools = _build_tools(enabled_tools)
     
     # Apply tool-specific configurations
+    log_configuring = logger.isEnabledFor(logging.INFO)
     for tool_name, tool_config in tools_config.items():
         if tool_name in tools:
-            logger.info(f"Configuring tool: {tool_name}")
+            if log_configuring:
+                logger.info("Configuring tool: %s", tool_name)
             # Tool configuration would be applied here
             # For example: tools[tool_name].configure(tool_config)
     
-    logger.info(f"Initialized {len(tools)} tools")
+    # Lookup-only tools are plain functions; wrap with ensure_async() where a coroutine is required
+    sync_count = sum(1 for tool in tools.values() if not inspect.iscoroutinefunction(tool.func))
+    logger.info("Initialized %d tools (%d synchronous)", len(tools), sync_count)
     
     return tools
\ No newline at end of file